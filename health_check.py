@@ -7,6 +7,7 @@ Health check service for Steam Game Downloader
 """
 import os
 import sys
+import time
 import requests
 import psutil
 import logging
@@ -15,7 +16,9 @@ import subprocess
 import shutil
 from pathlib import Path
 from datetime import datetime
-from flask import Flask, jsonify
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 
 # Configure logging
 logging.basicConfig(
@@ -41,13 +44,27 @@ STEAMCMD_PATHS = [
     shutil.which("steamcmd")
 ]
 
-# Create Flask app
-app = Flask(__name__)
+SAMPLE_TTL = 5.0  # seconds to reuse disk/memory samples between status checks
+
+# Create FastAPI app
+app = FastAPI(title="Steam Game Downloader Health Check")
+
+# Recent system samples, keyed by name: (monotonic timestamp, value)
+_sample_cache = {}
+
+def _cached_sample(name, sampler):
+    """Return sampler(), reusing the previous result for up to SAMPLE_TTL seconds"""
+    now = time.monotonic()
+    cached = _sample_cache.get(name)
+    if cached is None or now - cached[0] >= SAMPLE_TTL:
+        cached = (now, sampler())
+        _sample_cache[name] = cached
+    return cached[1]
 
 def check_disk_space():
     """Check available disk space"""
     try:
-        disk = psutil.disk_usage(str(DATA_DIR))
+        disk = _cached_sample("disk", lambda: psutil.disk_usage(str(DATA_DIR)))
         return {
             "total_gb": round(disk.total / (1024**3), 2),
             "used_gb": round(disk.used / (1024**3), 2),
@@ -62,7 +79,7 @@ def check_disk_space():
 def check_memory():
     """Check system memory"""
     try:
-        memory = psutil.virtual_memory()
+        memory = _cached_sample("memory", psutil.virtual_memory)
         return {
             "total_gb": round(memory.total / (1024**3), 2),
             "used_gb": round(memory.used / (1024**3), 2),
@@ -142,12 +159,12 @@ def check_downloads_dir():
         logger.error(f"Error checking downloads directory: {e}")
         return {"status": "error", "message": str(e)}
 
-@app.route('/health')
+@app.get('/health')
 def health():
     """Simple health check endpoint"""
-    return jsonify({"status": "healthy"})
+    return {"status": "healthy"}
 
-@app.route('/status')
+@app.get('/status')
 def status():
     """Detailed status check"""
     checks = {
@@ -177,7 +194,7 @@ def status():
     elif checks["overall_status"] == "warning":
         status_code = 429
     
-    return jsonify(checks), status_code
+    return JSONResponse(checks, status_code=status_code)
 
 def main():
     """Main function to run the health check service"""
@@ -186,7 +203,16 @@ def main():
         Path("/app/logs").mkdir(parents=True, exist_ok=True)
         
         logger.info(f"Starting health check service on port {HEALTH_PORT}")
-        app.run(host='0.0.0.0', port=HEALTH_PORT)
+        # Health probes are frequent, so skip per-request access logging
+        uvicorn.run(
+            app,
+            host='0.0.0.0',
+            port=HEALTH_PORT,
+            loop="uvloop",
+            http="httptools",
+            log_level="warning",
+            access_log=False
+        )
     except Exception as e:
         logger.error(f"Failed to start health check service: {e}")
         return 1
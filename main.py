@@ -4,10 +4,18 @@ Steam Game Downloader
 A web interface for downloading Steam games using SteamCMD
 """
 import os
+import re
+import asyncio
 import sys
+import signal
+import selectors
 import subprocess
 import threading
+import itertools
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import time
 import json
 from pathlib import Path
@@ -15,24 +23,44 @@ import gradio as gr
 import psutil
 from prometheus_client import Counter, Gauge, start_http_server
 
-# Configure logging
+# Configure logging; records are queued and a background listener thread
+# does the formatting and the console/file writes
+log_handlers = [
+    logging.StreamHandler(),
+    RotatingFileHandler("/app/logs/steam_downloader.log", maxBytes=10485760, backupCount=5)
+]
+for handler in log_handlers:
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("/app/logs/steam_downloader.log")
-    ]
+    format='%(message)s',
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger("SteamDownloader")
 
 # Constants and configuration
 PORT = int(os.environ.get("PORT", 8080))
 METRICS_PORT = int(os.environ.get("METRICS_PORT", 9090))
+MAX_DOWNLOADS = int(os.environ.get("MAX_DOWNLOADS", 5))
 DATA_DIR = Path(os.environ.get("RAILWAY_VOLUME_MOUNT_PATH", "/data"))
 DOWNLOADS_DIR = DATA_DIR / "downloads"
 PUBLIC_DIR = DATA_DIR / "public"
 STEAMCMD_PATH = Path("/app/steamcmd/steamcmd.sh")
+STATUS_RECHECK_INTERVAL = 30  # seconds between status checks when no download is running
+STATUS_LIVE_INTERVAL = 5  # seconds between status checks while downloads run, for the live clocks
+
+# SteamCMD installation check cache
+STEAMCMD_CHECK_TTL = 60  # seconds
+_steamcmd_ok = None
+_steamcmd_checked_at = 0.0
+
+# SteamCMD argument templates
+_CMD_PREFIX = (str(STEAMCMD_PATH), "+@NoPromptForPassword", "1")
+_CMD_LOGIN_ANONYMOUS = ("+login", "anonymous")
 
 # Create necessary directories
 DOWNLOADS_DIR.mkdir(parents=True, exist_ok=True)
@@ -45,180 +73,458 @@ DOWNLOAD_FAILURES = Counter('steam_downloads_failed', 'Failed downloads')
 ACTIVE_DOWNLOADS = Gauge('steam_downloads_active', 'Currently active downloads')
 DISK_USAGE = Gauge('steam_disk_usage_bytes', 'Disk usage in bytes')
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+def _format_size(size):
+    """Format a size in bytes as a human readable string"""
+    if size <= 0:
+        return "0.00 B"
+    # Each unit is a power of 1024, so the bit length picks it without comparisons
+    unit = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{size / (1 << (unit * 10)):.2f} {_SIZE_UNITS[unit]}"
+
+def _format_duration(seconds):
+    """Format a duration in seconds as HH:MM:SS"""
+    seconds = max(0, int(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+class DownloadStatus:
+    """State of a single SteamCMD download"""
+    __slots__ = (
+        "app_id", "download_path", "status", "progress", "downloaded_bytes",
+        "total_bytes", "start_time", "start_monotonic", "end_time", "error", "public_link", "process", "_snapshot"
+    )
+    
+    def __init__(self, app_id, download_path):
+        self.app_id = app_id
+        self.download_path = download_path
+        self.status = "starting"
+        self.progress = 0.0
+        self.downloaded_bytes = 0
+        self.total_bytes = 0
+        self.start_time = time.time()
+        self.start_monotonic = time.monotonic()
+        self.end_time = None
+        self.error = None
+        self.public_link = None
+        self.process = None
+        self._snapshot = None
+    
+    def set_public_link(self, public_link):
+        """Record the public link of a finished download"""
+        self.public_link = public_link
+        self._snapshot = None
+    
+    def to_dict(self):
+        """Build the UI status dict, leaving out the process object (not serializable)"""
+        # Finished downloads no longer change, so their dict is built only once
+        if self._snapshot is not None:
+            return self._snapshot
+        
+        info = {
+            "app_id": self.app_id,
+            "status": self.status,
+            "progress": self.progress,
+            "downloaded_size": _format_size(self.downloaded_bytes),
+            "total_size": _format_size(self.total_bytes),
+            "start_time": self.start_time,
+            "download_path": self.download_path
+        }
+        if self.end_time is None:
+            # Estimate on the monotonic clock, converting to wall-clock time only here
+            elapsed = time.monotonic() - self.start_monotonic
+            info["elapsed_time"] = _format_duration(elapsed)
+            if 0 < self.progress < 100:
+                remaining = elapsed * (100 / self.progress - 1)
+                info["remaining_time"] = _format_duration(remaining)
+                info["estimated_end_time"] = round(time.time() + remaining)
+        else:
+            info["elapsed_time"] = _format_duration(self.end_time - self.start_time)
+        if self.process is not None:
+            info["process"] = "Running" if self.process.poll() is None else "Completed"
+        if self.end_time is not None:
+            info["end_time"] = self.end_time
+        if self.error is not None:
+            info["error"] = self.error
+        if self.public_link is not None:
+            info["public_link"] = self.public_link
+        
+        if self.end_time is not None and (self.process is None or self.process.poll() is not None):
+            self._snapshot = info
+        return info
+
 # Track active downloads
 active_downloads = {}
 download_lock = threading.Lock()
+_status_listeners = set()  # (event loop, asyncio.Event) of every open status stream
+_download_sequence = itertools.count(1)  # Keeps download IDs unique within a process
+
+# SteamCMD output reactor: one selector (epoll/kqueue) watches every download's stdout
+_PROGRESS_RE = re.compile(rb'progress: (\d+\.\d+) \((\d+) / (\d+)\)')
+_selector = selectors.DefaultSelector()
+_reactor_thread = None
+_reactor_lock = threading.Lock()
+
+def _notify_status_change():
+    """Wake up status listeners; must be called with download_lock held"""
+    for loop, changed in _status_listeners:
+        try:
+            loop.call_soon_threadsafe(changed.set)
+        except RuntimeError:
+            # The listener's event loop has closed, so nobody is waiting on it
+            pass
+
+def _running_downloads():
+    """Count downloads that have not finished; must be called with download_lock held"""
+    return sum(1 for download in active_downloads.values() if download.end_time is None)
 
-def update_metrics():
-    """Update system metrics"""
+def _active_downloads_metric():
+    """Sample the active downloads gauge when Prometheus scrapes it"""
+    with download_lock:
+        return _running_downloads()
+
+def _disk_usage_metric():
+    """Sample the disk usage gauge when Prometheus scrapes it"""
     try:
-        # Update disk usage
-        disk_usage = psutil.disk_usage(str(DATA_DIR))
-        DISK_USAGE.set(disk_usage.used)
-        
-        # Update active downloads count
-        with download_lock:
-            ACTIVE_DOWNLOADS.set(len(active_downloads))
-            
+        return psutil.disk_usage(str(DATA_DIR)).used
     except Exception as e:
-        logger.error(f"Error updating metrics: {e}")
+        logger.error(f"Error reading disk usage: {e}")
+        return float("nan")
+
+# System gauges are computed on scrape, so nothing has to keep them up to date
+ACTIVE_DOWNLOADS.set_function(_active_downloads_metric)
+DISK_USAGE.set_function(_disk_usage_metric)
 
 def verify_steamcmd():
-    """Verify SteamCMD installation"""
+    """Verify SteamCMD installation, reusing the last result for STEAMCMD_CHECK_TTL seconds"""
+    global _steamcmd_ok, _steamcmd_checked_at
+    
+    now = time.monotonic()
+    if _steamcmd_ok is not None and now - _steamcmd_checked_at < STEAMCMD_CHECK_TTL:
+        return _steamcmd_ok
+    
     logger.info("Verifying SteamCMD installation...")
     
+    # An executable steamcmd.sh is a strong enough check; launching it is left to
+    # the first download, which reports SteamCMD's own errors anyway
     if not STEAMCMD_PATH.exists():
         logger.error("SteamCMD not found!")
-        return False
-        
-    try:
-        # Test SteamCMD
-        result = subprocess.run(
-            [str(STEAMCMD_PATH), "+quit"],
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
+        _steamcmd_ok = False
+    elif not os.access(STEAMCMD_PATH, os.X_OK):
+        logger.error(f"SteamCMD is not executable: {STEAMCMD_PATH}")
+        _steamcmd_ok = False
+    else:
+        logger.info("SteamCMD verification successful")
+        _steamcmd_ok = True
+    
+    _steamcmd_checked_at = now
+    return _steamcmd_ok
+
+def _parse_download_output(download_id, data, end):
+    """Update download state from the complete SteamCMD output lines in data[:end]"""
+    # Only the latest progress line matters, so skip straight to the last one.
+    # bytes/bytearray.find run in C, so chunks without markers cost almost nothing.
+    progress_match = None
+    progress_pos = data.rfind(b"progress:", 0, end)
+    if progress_pos >= 0:
+        progress_match = _PROGRESS_RE.match(data, progress_pos, end)
+    
+    # Likewise keep only the last error line
+    error_line = None
+    error_pos = data.rfind(b"ERROR", 0, end)
+    if error_pos >= 0:
+        line_start = data.rfind(b"\n", 0, error_pos) + 1
+        line_end = data.find(b"\n", error_pos, end)
+        error_line = data[line_start:line_end if line_end >= 0 else end]
+    
+    if progress_match is None and error_line is None:
+        return
+    
+    with download_lock:
+        download = active_downloads[download_id]
+        if progress_match:
+            download.progress = float(progress_match.group(1))
+            download.downloaded_bytes = int(progress_match.group(2))
+            download.total_bytes = int(progress_match.group(3))
+        if error_line is not None:
+            download.error = error_line.decode("utf-8", errors="replace").strip()
+        _notify_status_change()
+
+def _handle_output(state, chunk):
+    """Buffer a chunk of SteamCMD output and parse the complete lines in it"""
+    buffer = state["buffer"]
+    buffer += chunk
+    end = buffer.rfind(b"\n")
+    if end < 0:
+        return
+    
+    # Only pay for copying and decoding the output when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"SteamCMD output ({state['download_id']}): {buffer[:end].decode('utf-8', errors='replace')}")
+    _parse_download_output(state["download_id"], buffer, end)
+    
+    # Keep the partial last line for the next chunk
+    del buffer[:end + 1]
+
+def _finish_download(state):
+    """Record the result of a SteamCMD process whose output has closed"""
+    download_id = state["download_id"]
+    process = state["process"]
+    
+    if state["buffer"]:
+        _parse_download_output(download_id, state["buffer"], len(state["buffer"]))
+    process.stdout.close()
+    returncode = process.wait()
+    
+    with download_lock:
+        download = active_downloads[download_id]
+        app_id = download.app_id
+        download_path = Path(download.download_path)
+        download.end_time = time.time()
         
-        if result.returncode != 0:
-            logger.error(f"SteamCMD verification failed: {result.stderr}")
-            return False
+        if download.status == "stopping":
+            download.status = "stopped"
+        elif returncode == 0:
+            download.status = "completed"
+        else:
+            download.status = "failed"
+            if download.error is None:
+                download.error = f"SteamCMD exited with code {returncode}"
+        status = download.status
+        error = download.error
+        _notify_status_change()
+    
+    if status == "completed":
+        # Create a public link
+        try:
+            # Create symlink in public directory
+            public_link = PUBLIC_DIR / app_id
+            if public_link.exists():
+                if public_link.is_symlink():
+                    public_link.unlink()
             
-        logger.info("SteamCMD verification successful")
-        return True
+            # Create relative symlink
+            public_link.symlink_to(download_path)
+            
+            with download_lock:
+                active_downloads[download_id].set_public_link(str(public_link))
+                _notify_status_change()
+                
+        except Exception as e:
+            logger.error(f"Error creating public link: {e}")
         
-    except Exception as e:
-        logger.error(f"SteamCMD verification error: {e}")
-        return False
+        DOWNLOAD_COUNTER.inc()
+        logger.info(f"Download completed for App ID: {app_id}")
+    elif status == "failed":
+        DOWNLOAD_FAILURES.inc()
+        logger.error(f"Download failed for App ID: {app_id}: {error}")
+    else:
+        logger.info(f"Download stopped for App ID: {app_id}")
+
+def _reactor_loop():
+    """Watch the output of every running SteamCMD process from one thread"""
+    while True:
+        try:
+            events = _selector.select(timeout=0.25)
+        except Exception as e:
+            logger.error(f"Error waiting for SteamCMD output: {e}")
+            time.sleep(0.25)
+            continue
+        
+        for key, _ in events:
+            state = key.data
+            try:
+                chunk = os.read(key.fd, 65536)
+            except BlockingIOError:
+                # Spurious readiness; the pipe is non-blocking so nothing is stuck
+                continue
+            except OSError as e:
+                logger.error(f"Error reading SteamCMD output for {state['download_id']}: {e}")
+                chunk = b""
+            
+            if chunk:
+                _handle_output(state, chunk)
+                continue
+            
+            # End of output: the process has exited or closed its stdout
+            _selector.unregister(key.fileobj)
+            try:
+                _finish_download(state)
+            except Exception as e:
+                logger.error(f"Error finishing download {state['download_id']}: {e}")
+
+def _start_reactor():
+    """Start the SteamCMD output reactor thread if it is not running yet"""
+    global _reactor_thread
+    with _reactor_lock:
+        if _reactor_thread is None or not _reactor_thread.is_alive():
+            _reactor_thread = threading.Thread(target=_reactor_loop, name="steamcmd-reactor")
+            _reactor_thread.daemon = True
+            _reactor_thread.start()
 
 def download_game(app_id, username=None, password=None, steam_guard=None):
     """Download a Steam game using SteamCMD"""
     if not app_id or not app_id.strip():
         return "Error: Please enter a valid App ID"
     
+    if not verify_steamcmd():
+        return "Error: SteamCMD is not installed correctly"
+    
     app_id = app_id.strip()
-    download_id = f"{app_id}_{int(time.time())}"
     download_path = DOWNLOADS_DIR / app_id
     
-    # Create download directory
-    download_path.mkdir(parents=True, exist_ok=True)
-    
-    logger.info(f"Starting download for App ID: {app_id}")
+    # Use login details if provided
+    if username and password:
+        login = ("+login", username, password, steam_guard) if steam_guard else ("+login", username, password)
+    else:
+        login = _CMD_LOGIN_ANONYMOUS
     
     # Build SteamCMD command
     cmd = [
-        str(STEAMCMD_PATH),
-        "+@NoPromptForPassword 1"
+        *_CMD_PREFIX,
+        *login,
+        "+force_install_dir", str(download_path),
+        "+app_update", app_id, "validate",
+        "+quit"
     ]
     
-    # Add login details if provided
-    if username and password:
-        cmd.extend([
-            f"+login {username} {password}"
-        ])
-        if steam_guard:
-            cmd[-1] += f" {steam_guard}"
-    else:
-        cmd.append("+login anonymous")
-    
-    # Add download commands
-    cmd.extend([
-        f"+force_install_dir {download_path}",
-        f"+app_update {app_id} validate",
-        "+quit"
-    ])
+    with download_lock:
+        # A second SteamCMD on the same install dir would fight the first one over it
+        for other_id, other in active_downloads.items():
+            if other.app_id == app_id and other.end_time is None:
+                return f"Error: App ID {app_id} is already downloading (ID: {other_id})"
+        
+        running = _running_downloads()
+        if running >= MAX_DOWNLOADS:
+            logger.warning(f"Not starting App ID {app_id}: {running} downloads already running")
+            return f"Error: Too many downloads running (limit: {MAX_DOWNLOADS}), try again later"
+        
+        download_id = f"{app_id}_{int(time.time())}_{next(_download_sequence)}"
+        active_downloads[download_id] = DownloadStatus(app_id, str(download_path))
+        _notify_status_change()
     
-    # Start download in a separate thread
-    def download_thread():
-        try:
-            with download_lock:
-                active_downloads[download_id] = {
-                    "app_id": app_id,
-                    "status": "starting",
-                    "start_time": time.time(),
-                    "download_path": str(download_path)
-                }
-                
-            # Run SteamCMD command
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            with download_lock:
-                active_downloads[download_id]["status"] = "downloading"
-                active_downloads[download_id]["process"] = process
-            
-            # Wait for completion
-            stdout, stderr = process.communicate()
-            
-            if process.returncode == 0:
-                # Success
-                with download_lock:
-                    active_downloads[download_id]["status"] = "completed"
-                    active_downloads[download_id]["end_time"] = time.time()
-                
-                # Create a public link
-                try:
-                    # Create symlink in public directory
-                    public_link = PUBLIC_DIR / app_id
-                    if public_link.exists():
-                        if public_link.is_symlink():
-                            public_link.unlink()
-                    
-                    # Create relative symlink
-                    public_link.symlink_to(download_path)
-                    
-                    with download_lock:
-                        active_downloads[download_id]["public_link"] = str(public_link)
-                        
-                except Exception as e:
-                    logger.error(f"Error creating public link: {e}")
-                
-                DOWNLOAD_COUNTER.inc()
-                logger.info(f"Download completed for App ID: {app_id}")
-            else:
-                # Failure
-                with download_lock:
-                    active_downloads[download_id]["status"] = "failed"
-                    active_downloads[download_id]["error"] = stderr
-                
-                DOWNLOAD_FAILURES.inc()
-                logger.error(f"Download failed for App ID: {app_id}: {stderr}")
-            
-            # Update metrics
-            update_metrics()
-            
-        except Exception as e:
-            with download_lock:
-                active_downloads[download_id]["status"] = "error"
-                active_downloads[download_id]["error"] = str(e)
-            
-            DOWNLOAD_FAILURES.inc()
-            logger.error(f"Error during download for App ID {app_id}: {e}")
-            update_metrics()
+    logger.info(f"Starting download for App ID: {app_id}")
     
-    # Start the download thread
-    download_thread = threading.Thread(target=download_thread)
-    download_thread.daemon = True
-    download_thread.start()
+    process = None
+    try:
+        # Create download directory
+        download_path.mkdir(parents=True, exist_ok=True)
+        
+        # Run SteamCMD command; its output is read by the reactor thread.
+        # A new session lets stop_download signal steamcmd.sh and its children together.
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        
+        with download_lock:
+            active_downloads[download_id].status = "downloading"
+            active_downloads[download_id].process = process
+            _notify_status_change()
+        
+        # Never let one quiet pipe block the reactor serving every download
+        os.set_blocking(process.stdout.fileno(), False)
+        _start_reactor()
+        _selector.register(
+            process.stdout,
+            selectors.EVENT_READ,
+            data={"download_id": download_id, "process": process, "buffer": bytearray()}
+        )
+        
+    except Exception as e:
+        if process is not None:
+            # SteamCMD started but the reactor isn't watching it: nothing would drain
+            # its pipe or reap it, so end it here rather than leave it running
+            _signal_download(process, signal.SIGKILL)
+            process.stdout.close()
+            process.wait()
+        
+        with download_lock:
+            active_downloads[download_id].status = "error"
+            active_downloads[download_id].error = str(e)
+            active_downloads[download_id].end_time = time.time()
+            _notify_status_change()
+        
+        DOWNLOAD_FAILURES.inc()
+        logger.error(f"Error during download for App ID {app_id}: {e}")
+        return f"Error: Could not start download for App ID: {app_id}: {e}"
     
     return f"Download started for App ID: {app_id} (ID: {download_id})"
 
+def _signal_download(process, sig):
+    """Send a signal to a SteamCMD process and every child in its session"""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+def stop_download(download_id):
+    """Stop a running download"""
+    download_id = (download_id or "").strip()
+    
+    with download_lock:
+        download = active_downloads.get(download_id)
+        process = download.process if download else None
+        if process is None or process.poll() is not None:
+            return f"Error: No running download with ID: {download_id}"
+        download.status = "stopping"
+        _notify_status_change()
+    
+    logger.info(f"Stopping download {download_id}")
+    
+    # The reactor unregisters the pipe and records the result once the output closes
+    _signal_download(process, signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        logger.warning(f"SteamCMD did not exit for {download_id}, killing it")
+        _signal_download(process, signal.SIGKILL)
+    
+    return f"Download stopped (ID: {download_id})"
+
 def get_downloads_status():
     """Get the status of all downloads"""
     with download_lock:
-        # Create a copy without process objects (not serializable)
-        downloads_copy = {}
-        for download_id, download in active_downloads.items():
-            download_copy = download.copy()
-            if "process" in download_copy:
-                download_copy["process"] = "Running" if download_copy["process"].poll() is None else "Completed"
-            downloads_copy[download_id] = download_copy
-        
-        return downloads_copy
+        return {download_id: download.to_dict() for download_id, download in active_downloads.items()}
+
+async def stream_downloads_status():
+    """Push the status of all downloads to the UI whenever it changes"""
+    # Waiting on an asyncio.Event keeps open pages off the executor threads;
+    # _notify_status_change sets it from whichever thread changed the status
+    listener = (asyncio.get_running_loop(), asyncio.Event())
+    changed = listener[1]
+    with download_lock:
+        _status_listeners.add(listener)
+    
+    last_status = None
+    try:
+        while True:
+            # Clear before reading, so a change made meanwhile wakes the next wait
+            changed.clear()
+            
+            # Only send the status when it actually differs from what the UI shows.
+            # A running download's elapsed and remaining times move every second,
+            # so in practice this skips pushes only once everything has finished.
+            with download_lock:
+                status = {download_id: download.to_dict() for download_id, download in active_downloads.items()}
+                running = _running_downloads()
+            if status != last_status:
+                last_status = status
+                yield status
+            
+            # SteamCMD's piped output comes in bursts; recheck often while anything
+            # runs so the clocks keep ticking between them
+            timeout = STATUS_LIVE_INTERVAL if running else STATUS_RECHECK_INTERVAL
+            try:
+                await asyncio.wait_for(changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        # Runs when Gradio cancels or closes the stream of a page that went away
+        with download_lock:
+            _status_listeners.discard(listener)
 
 def create_gradio_interface():
     """Create Gradio web interface"""
@@ -237,6 +543,10 @@ def create_gradio_interface():
                 
                 download_btn = gr.Button("Download Game")
                 status_text = gr.Markdown("Ready to download")
+                
+                with gr.Row():
+                    stop_id = gr.Textbox(label="Download ID", placeholder="ID of the download to stop")
+                    stop_btn = gr.Button("Stop Download")
             
             with gr.Column():
                 download_info = gr.JSON(label="Download Status")
@@ -249,6 +559,13 @@ def create_gradio_interface():
             outputs=status_text
         )
         
+        # Stop function
+        stop_btn.click(
+            fn=stop_download,
+            inputs=[stop_id],
+            outputs=status_text
+        )
+        
         # Get status function
         refresh_btn.click(
             fn=get_downloads_status,
@@ -256,12 +573,12 @@ def create_gradio_interface():
             outputs=download_info
         )
         
-        # Auto-refresh every 5 seconds
-        gr.on(
-            triggers=[interface.load, gr.every(5)],
-            fn=get_downloads_status,
+        # Push status updates as downloads change
+        interface.load(
+            fn=stream_downloads_status,
             inputs=[],
-            outputs=download_info
+            outputs=download_info,
+            concurrency_limit=None
         )
     
     return interface
@@ -291,9 +608,6 @@ def main():
         # Start metrics server
         start_metrics_server()
         
-        # Start initial metrics update
-        update_metrics()
-        
         # Create and start Gradio interface
         logger.info("Creating Gradio interface...")
         demo = create_gradio_interface()
@@ -2,43 +2,99 @@
 import os
 import sys
 import time
+import heapq
+import queue
+import atexit
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import psutil
 import requests
-import json
+import orjson
 from pathlib import Path
 import argparse
+from array import array
 from datetime import datetime, timedelta
 from concurrent.futures import ThreadPoolExecutor
 
-# Configure logging
+# Configure logging; records are queued and a background listener thread
+# does the formatting and the console/file writes
+log_handlers = [
+    logging.StreamHandler(),
+    RotatingFileHandler(os.path.join('/app/logs', 'monitor.log'), maxBytes=10485760, backupCount=5)
+]
+for handler in log_handlers:
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+log_queue = queue.Queue(-1)
+log_listener = QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(os.path.join('/app/logs', 'monitor.log'))
-    ]
+    format='%(message)s',
+    handlers=[QueueHandler(log_queue)]
 )
 logger = logging.getLogger(__name__)
 
+class MetricHistory:
+    """Ring buffer of metric samples kept as flat arrays of timestamps and values"""
+    def __init__(self, size):
+        self.size = size
+        self.timestamps = array('q', bytes(8 * size))  # Epoch nanoseconds
+        self.values = array('d', bytes(8 * size))
+        self.count = 0
+        self.cursor = 0
+        
+    def append(self, value):
+        """Record a sample taken now, overwriting the oldest one when full"""
+        self.timestamps[self.cursor] = time.time_ns()
+        self.values[self.cursor] = value
+        self.cursor = (self.cursor + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+        
+    def __len__(self):
+        return self.count
+        
+    def __iter__(self):
+        """Yield (datetime, value) samples, oldest first"""
+        start = (self.cursor - self.count) % self.size
+        for i in range(self.count):
+            index = (start + i) % self.size
+            yield datetime.fromtimestamp(self.timestamps[index] / 1e9), self.values[index]
+
 class SystemMonitor:
     def __init__(self, check_interval=60, alert_threshold=90, service_url="http://localhost:8080"):
         self.check_interval = check_interval
         self.alert_threshold = alert_threshold
         self.service_url = service_url
+        self.max_history_points = 1440  # Store 24 hours of data at 1-minute intervals
+        
+        # Fixed-size ring buffers overwrite the oldest point, so history never needs trimming
         self.history = {
-            'cpu': [],
-            'memory': [],
-            'disk': [],
-            'response_time': []
+            metric: MetricHistory(self.max_history_points)
+            for metric in ('cpu', 'memory', 'disk', 'response_time')
         }
-        self.max_history_points = 1440  # Store 24 hours of data at 1-minute intervals
+        
+        # Keep-alive session so health checks reuse one connection to the service
+        self.session = requests.Session()
+        self.session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=2))
+        
+        # One pool for the whole run instead of new threads every interval
+        self.executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="monitor")
+        
+        # Monitoring iterations so far, used to schedule periodic work
+        self._tick = 0
+        
+        # Disk usage changes slowly, so only sample it every 10 intervals
+        self.disk_sample_interval = check_interval * 10
+        self._disk_cache = (None, 0.0)  # (monotonic timestamp, percent)
+        
+        # Prime the CPU counters so each check reports usage since the previous one
+        psutil.cpu_percent(interval=None)
         
     def check_cpu(self):
-        """Check CPU usage"""
-        cpu_percent = psutil.cpu_percent(interval=1)
-        self.history['cpu'].append((datetime.now(), cpu_percent))
+        """Check CPU usage since the previous check"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        self.history['cpu'].append(cpu_percent)
         
         if cpu_percent > self.alert_threshold:
             logger.warning(f"HIGH CPU USAGE: {cpu_percent}%")
@@ -48,7 +104,7 @@ class SystemMonitor:
     def check_memory(self):
         """Check memory usage"""
         memory = psutil.virtual_memory()
-        self.history['memory'].append((datetime.now(), memory.percent))
+        self.history['memory'].append(memory.percent)
         
         if memory.percent > self.alert_threshold:
             logger.warning(f"HIGH MEMORY USAGE: {memory.percent}%")
@@ -56,23 +112,27 @@ class SystemMonitor:
         return memory.percent
         
     def check_disk(self):
-        """Check disk usage"""
-        disk = psutil.disk_usage('/data')
-        self.history['disk'].append((datetime.now(), disk.percent))
+        """Check disk usage, sampling the filesystem at most every disk_sample_interval seconds"""
+        now = time.monotonic()
+        sampled_at, disk_percent = self._disk_cache
+        if sampled_at is None or now - sampled_at >= self.disk_sample_interval:
+            disk_percent = psutil.disk_usage('/data').percent
+            self._disk_cache = (now, disk_percent)
+        self.history['disk'].append(disk_percent)
         
-        if disk.percent > self.alert_threshold:
-            logger.warning(f"HIGH DISK USAGE: {disk.percent}%")
+        if disk_percent > self.alert_threshold:
+            logger.warning(f"HIGH DISK USAGE: {disk_percent}%")
             
-        return disk.percent
+        return disk_percent
         
     def check_service_health(self):
         """Check service health and response time"""
         try:
             start_time = time.time()
-            response = requests.get(f"{self.service_url}/health", timeout=5)
+            response = self.session.get(f"{self.service_url}/health", timeout=5)
             response_time = (time.time() - start_time) * 1000  # ms
             
-            self.history['response_time'].append((datetime.now(), response_time))
+            self.history['response_time'].append(response_time)
             
             if response.status_code != 200:
                 logger.error(f"SERVICE HEALTH CHECK FAILED: Status {response.status_code}")
@@ -89,48 +149,45 @@ class SystemMonitor:
             
     def check_running_processes(self):
         """Check running processes"""
+        # process_iter reuses its cached Process objects, so cpu_percent is a
+        # delta since the previous call rather than 0 for every process
         processes = []
-        for proc in psutil.process_iter(['pid', 'name', 'username', 'memory_percent', 'cpu_percent']):
+        for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'cpu_percent']):
             try:
                 proc_info = proc.info
+                # psutil reports None for values it was denied access to; count
+                # them as 0 so both the ranking and the log lines can format them
+                proc_info['cpu_percent'] = proc_info['cpu_percent'] or 0.0
+                proc_info['memory_percent'] = proc_info['memory_percent'] or 0.0
                 processes.append(proc_info)
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
                 
-        # Sort by CPU and memory usage (descending)
-        top_cpu = sorted(processes, key=lambda p: p['cpu_percent'], reverse=True)[:5]
-        top_memory = sorted(processes, key=lambda p: p['memory_percent'], reverse=True)[:5]
+        # Select the top 5 by CPU and memory usage without sorting everything
+        top_cpu = heapq.nlargest(5, processes, key=lambda p: p['cpu_percent'])
+        top_memory = heapq.nlargest(5, processes, key=lambda p: p['memory_percent'])
         
         return {
             'top_cpu': top_cpu,
             'top_memory': top_memory
         }
             
-    def trim_history(self):
-        """Trim history to maximum size"""
-        for metric in self.history:
-            if len(self.history[metric]) > self.max_history_points:
-                self.history[metric] = self.history[metric][-self.max_history_points:]
-                
     def export_metrics(self, file_path):
         """Export metrics to JSON file"""
-        export_data = {}
-        
-        # Convert datetime objects to strings
-        for metric, values in self.history.items():
-            export_data[metric] = [(dt.isoformat(), value) for dt, value in values]
+        # orjson serializes datetime objects itself, so no isoformat() strings are built
+        export_data = {metric: list(values) for metric, values in self.history.items()}
             
         # Add timestamp
-        export_data['timestamp'] = datetime.now().isoformat()
+        export_data['timestamp'] = datetime.now()
         export_data['service_url'] = self.service_url
         
         # Write to file
-        with open(file_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
             
         logger.info(f"Metrics exported to {file_path}")
         
-    def run(self, duration_minutes=0, export_path=None):
+    def run(self, duration_minutes=0, export_path=None, export_every=10):
         """Run monitoring for specified duration (0 = indefinitely)"""
         logger.info(f"Starting system monitoring (interval: {self.check_interval}s)")
         logger.info(f"Alert threshold: {self.alert_threshold}%")
@@ -143,17 +200,17 @@ class SystemMonitor:
         
         try:
             while True:
-                with ThreadPoolExecutor(max_workers=4) as executor:
-                    cpu_future = executor.submit(self.check_cpu)
-                    memory_future = executor.submit(self.check_memory)
-                    disk_future = executor.submit(self.check_disk)
-                    health_future = executor.submit(self.check_service_health)
-                    
-                    # Wait for all checks to complete
-                    cpu_percent = cpu_future.result()
-                    memory_percent = memory_future.result()
-                    disk_percent = disk_future.result()
-                    health_status, response_time = health_future.result()
+                self._tick += 1
+                cpu_future = self.executor.submit(self.check_cpu)
+                memory_future = self.executor.submit(self.check_memory)
+                disk_future = self.executor.submit(self.check_disk)
+                health_future = self.executor.submit(self.check_service_health)
+                
+                # Wait for all checks to complete
+                cpu_percent = cpu_future.result()
+                memory_percent = memory_future.result()
+                disk_percent = disk_future.result()
+                health_status, response_time = health_future.result()
                     
                 # Log summary
                 logger.info(f"System Status - CPU: {cpu_percent:.1f}%, "
@@ -162,7 +219,7 @@ class SystemMonitor:
                           f"Service: {'OK' if health_status else 'FAIL'} ({response_time:.1f}ms)")
                 
                 # Check running processes periodically (every 10 intervals)
-                if int(time.time()) % (self.check_interval * 10) < self.check_interval:
+                if self._tick % 10 == 0:
                     proc_info = self.check_running_processes()
                     logger.info("Top CPU consuming processes:")
                     for proc in proc_info['top_cpu']:
@@ -172,11 +229,10 @@ class SystemMonitor:
                     for proc in proc_info['top_memory']:
                         logger.info(f"  PID {proc['pid']}: {proc['name']} ({proc['memory_percent']:.1f}%)")
                 
-                # Trim history to prevent memory growth
-                self.trim_history()
-                
-                # Export metrics if path is provided
-                if export_path:
+                # Export metrics every few intervals if path is provided; each export
+                # rewrites the whole history, so doing it every tick is wasted work.
+                # export_every=0 leaves only the export at shutdown
+                if export_path and export_every > 0 and self._tick % export_every == 0:
                     self.export_metrics(export_path)
                 
                 # Check if we've reached the end time
@@ -191,9 +247,26 @@ class SystemMonitor:
         except Exception as e:
             logger.error(f"Monitoring error: {str(e)}")
             return 1
+        finally:
+            self.executor.shutdown(wait=True)
+            self.session.close()
+            
+            # Write out the samples collected since the last periodic export
+            if export_path:
+                try:
+                    self.export_metrics(export_path)
+                except Exception as e:
+                    logger.error(f"Failed to export metrics: {str(e)}")
             
         return 0
 
+def non_negative_int(value):
+    """argparse type for counts where 0 is meaningful but negatives are not"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or greater, got {number}")
+    return number
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Monitor system and service health")
     parser.add_argument("--interval", type=int, default=60, help="Check interval in seconds")
@@ -201,6 +274,8 @@ def parse_arguments():
     parser.add_argument("--url", default="http://localhost:8080", help="Service URL to monitor")
     parser.add_argument("--duration", type=int, default=0, help="Monitoring duration in minutes (0 = indefinitely)")
     parser.add_argument("--export", help="Path to export metrics JSON file")
+    parser.add_argument("--export-every", type=non_negative_int, default=10,
+                        help="Export metrics every N intervals (0 = only on exit)")
     return parser.parse_args()
 
 def main():
@@ -217,7 +292,8 @@ def main():
     
     return monitor.run(
         duration_minutes=args.duration,
-        export_path=args.export
+        export_path=args.export,
+        export_every=args.export_every
     )
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
 import os
 import sys
+import signal
 import subprocess
+import threading
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tarfile
+import io
+import hashlib
 import shutil
 from pathlib import Path
 
@@ -14,11 +20,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class HashingReader:
+    """File-like wrapper that feeds everything read through it into a hash"""
+    def __init__(self, raw, digest):
+        self.raw = raw
+        self.digest = digest
+        
+    def read(self, size=-1):
+        data = self.raw.read(size)
+        self.digest.update(data)
+        return data
+
 class SteamCMDInstaller:
     def __init__(self):
         self.steamcmd_path = Path('/app/steamcmd')
         self.steamcmd_exe = self.steamcmd_path / 'steamcmd.sh'
         self.steamcmd_url = "https://steamcdn-a.akamaihd.net/client/installer/steamcmd_linux.tar.gz"
+        self.steamcmd_sha256 = os.environ.get("STEAMCMD_SHA256")  # Optional pinned archive digest
+        self.steamcmd_timeout = 300  # seconds; the first run also downloads SteamCMD's update
+        self.steamcmd_timed_out = False  # Set when the last verify run was killed by the watchdog
+        
+        # Shared session so retries and repair attempts reuse the CDN connection
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        ))
         
     def check_dependencies(self):
         """Check and install required system dependencies"""
@@ -56,24 +84,40 @@ class SteamCMDInstaller:
         """Download SteamCMD from official source"""
         try:
             logger.info("Downloading SteamCMD...")
-            response = requests.get(self.steamcmd_url, stream=True)
-            response.raise_for_status()
             
             # Create steamcmd directory if it doesn't exist
             self.steamcmd_path.mkdir(parents=True, exist_ok=True)
             
-            # Download and extract
-            tar_path = self.steamcmd_path / 'steamcmd_linux.tar.gz'
-            with open(tar_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            digest = hashlib.sha256()
+            with self.session.get(self.steamcmd_url, stream=True, timeout=(5, 30)) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                reader = HashingReader(response.raw, digest)
+                
+                if self.steamcmd_sha256:
+                    # With a pinned digest, hold the archive (a few MB) in memory and
+                    # check it before a single member is written to disk
+                    archive = io.BytesIO()
+                    shutil.copyfileobj(reader, archive, 1 << 20)
+                    sha256 = digest.hexdigest()
+                    logger.info(f"SteamCMD archive SHA-256: {sha256}")
+                    if sha256 != self.steamcmd_sha256.lower():
+                        logger.error(f"SteamCMD archive checksum mismatch, expected {self.steamcmd_sha256}")
+                        return False
+                    archive.seek(0)
+                    with tarfile.open(fileobj=archive, mode='r|gz') as tar:
+                        tar.extractall(path=self.steamcmd_path)
+                else:
+                    # Extract the archive straight from the response, without a temporary
+                    # file, hashing the bytes on the way through
+                    with tarfile.open(fileobj=reader, mode='r|gz') as tar:
+                        tar.extractall(path=self.steamcmd_path)
                     
-            # Extract the archive
-            with tarfile.open(tar_path) as tar:
-                tar.extractall(path=self.steamcmd_path)
+                    # tarfile stops at the end-of-archive marker; hash the rest of the file too
+                    while reader.read(1 << 20):
+                        pass
+                    logger.info(f"SteamCMD archive SHA-256: {digest.hexdigest()}")
                 
-            # Cleanup
-            tar_path.unlink()
             logger.info("SteamCMD downloaded and extracted successfully")
             return True
             
@@ -81,8 +125,18 @@ class SteamCMDInstaller:
             logger.error(f"Failed to download SteamCMD: {str(e)}")
             return False
 
-    def verify_installation(self):
-        """Verify SteamCMD installation"""
+    def _kill_steamcmd(self, process):
+        """Kill a SteamCMD process that ran past steamcmd_timeout, with its children"""
+        logger.error(f"SteamCMD did not finish within {self.steamcmd_timeout}s, killing it")
+        self.steamcmd_timed_out = True
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def verify_installation(self, update=False):
+        """Verify SteamCMD installation; with update, also log in so it finishes its self-update"""
+        self.steamcmd_timed_out = False
         try:
             logger.info("Verifying SteamCMD installation...")
             
@@ -94,15 +148,37 @@ class SteamCMDInstaller:
             # Make executable
             self.steamcmd_exe.chmod(0o755)
             
-            # Test SteamCMD
-            result = subprocess.run(
-                [str(self.steamcmd_exe), '+quit'],
-                capture_output=True,
-                text=True
+            # Test SteamCMD; after a fresh download one anonymous login covers both
+            # the check and the initial self-update, so SteamCMD is launched once.
+            # An existing install only gets the offline check, so a failed login
+            # (Steam maintenance, rate limiting, no network) can't condemn it
+            command = [str(self.steamcmd_exe)]
+            if update:
+                command += ['+login', 'anonymous']
+            command.append('+quit')
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+                start_new_session=True
             )
             
-            if result.returncode != 0:
-                logger.error(f"SteamCMD verification failed: {result.stderr}")
+            # Stream the output to the log as it arrives; if SteamCMD hangs, the
+            # watchdog kills its whole session, which also ends the loop below
+            watchdog = threading.Timer(self.steamcmd_timeout, self._kill_steamcmd, args=(process,))
+            watchdog.start()
+            try:
+                for line in process.stdout:
+                    logger.info(f"steamcmd: {line.rstrip()}")
+                returncode = process.wait()
+            finally:
+                watchdog.cancel()
+            
+            if returncode != 0:
+                logger.error(f"SteamCMD verification failed with exit code {returncode}")
                 return False
                 
             logger.info("SteamCMD verified successfully")
@@ -120,6 +196,10 @@ class SteamCMDInstaller:
                 logger.info("SteamCMD already installed, verifying...")
                 if self.verify_installation():
                     return True
+                if self.steamcmd_timed_out:
+                    # A hang doesn't show the files are broken; keep them for the next run
+                    logger.error("SteamCMD hung during verification, keeping the existing installation")
+                    return False
                 logger.info("Existing installation is invalid, reinstalling...")
                 shutil.rmtree(self.steamcmd_path)
             
@@ -131,14 +211,10 @@ class SteamCMDInstaller:
             if not self.download_steamcmd():
                 return False
             
-            # Verify installation
-            if not self.verify_installation():
+            # Verify installation (also runs the initial update)
+            if not self.verify_installation(update=True):
                 return False
             
-            # Initial update
-            logger.info("Running initial SteamCMD update...")
-            subprocess.run([str(self.steamcmd_exe), '+login', 'anonymous', '+quit'])
-            
             return True
             
         except Exception as e: